@@ -1,21 +1,46 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session, send_from_directory
+from flask import Flask, Request, abort, render_template, request, redirect, url_for, flash, jsonify, session, send_from_directory
 from flask_sqlalchemy import SQLAlchemy
+from flask_caching import Cache
+from flask_session import Session
 from flask_socketio import SocketIO, emit, join_room, leave_room
 from datetime import datetime, timedelta
 from functools import wraps
+from jinja2 import FileSystemBytecodeCache
 from werkzeug.utils import secure_filename
+from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import event, func, insert, literal, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import joinedload, load_only, selectinload
 import os
-import uuid
-import zipfile
+import json
+import hmac
+import hashlib
+import secrets
 import shutil
-import random
-from openpyxl import load_workbook
+import subprocess
+import queue
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 # Get the directory where this script is located
 basedir = os.path.abspath(os.path.dirname(__file__))
 
+# Request class with a cap on in-memory form data; uploaded file parts above
+# 500KB are already spooled to temporary files on disk by Werkzeug
+class UploadRequest(Request):
+    max_form_memory_size = 512 * 1024
+
 app = Flask(__name__, template_folder=os.path.join(basedir, 'templates'), 
             static_folder=os.path.join(basedir, 'static'))
+app.request_class = UploadRequest
+# Keep compiled templates on disk so fresh workers skip re-parsing them; never re-check sources in production
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+if os.environ.get('FLASK_ENV') == 'production':
+    app.config['TEMPLATES_AUTO_RELOAD'] = False
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'your-secret-key-change-in-production')
 # Database configuration - use environment variable for production, sqlite for local
 database_url = os.environ.get('DATABASE_URL', 'sqlite:///football_auction.db')
@@ -24,27 +49,98 @@ if database_url.startswith('postgres://'):
     database_url = database_url.replace('postgres://', 'postgresql://', 1)
 app.config['SQLALCHEMY_DATABASE_URI'] = database_url
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Connection pool tuned for Render Postgres (recycle before the server drops idle connections)
+# gevent workers run many requests at once, so keep enough connections open to avoid reconnecting
+if not database_url.startswith('sqlite'):
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 20)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 40)),
+        'pool_pre_ping': True,
+        'pool_recycle': 300,
+        'insertmanyvalues_page_size': 1000
+    }
+    # psycopg2 can also batch executemany UPDATE/DELETE (the option is specific to that driver)
+    if make_url(database_url).get_dialect().driver == 'psycopg2':
+        app.config['SQLALCHEMY_ENGINE_OPTIONS']['executemany_mode'] = 'values_plus_batch'
+else:
+    # WAL lets page reads run alongside bid writes; synchronous=NORMAL is safe in WAL mode
+    @event.listens_for(Engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.close()
 app.config['UPLOAD_FOLDER'] = 'static/uploads/team_logos'
 app.config['PLAYER_PHOTO_FOLDER'] = 'static/uploads/player_photos'
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB max file size (for bulk uploads)
-ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp', 'svg'}
+# Create the upload folders (and the bulk-upload temp folder) once at startup; a restart finds them already there
+for upload_folder in (app.config['UPLOAD_FOLDER'], app.config['PLAYER_PHOTO_FOLDER'], 'static/temp_photos'):
+    if not os.path.isdir(upload_folder):
+        os.makedirs(upload_folder, exist_ok=True)
+ALLOWED_EXTENSIONS = frozenset({'png', 'jpg', 'jpeg', 'gif', 'webp', 'svg'})
+# Cache configuration - use Redis when REDIS_URL is provided, in-process cache for local
+redis_url = os.environ.get('REDIS_URL')
+if redis_url:
+    app.config['CACHE_TYPE'] = 'RedisCache'
+    app.config['CACHE_REDIS_URL'] = redis_url
+else:
+    # SimpleCache lives in one process: bulk-upload job status and cache invalidations would not reach
+    # other workers, so refuse to start several gunicorn workers without Redis
+    if int(os.environ.get('WEB_CONCURRENCY', 1)) > 1:
+        raise RuntimeError('REDIS_URL must be set when WEB_CONCURRENCY is greater than 1 '
+                           '(the in-process cache is not shared between workers)')
+    app.config['CACHE_TYPE'] = 'SimpleCache'
+app.config['CACHE_DEFAULT_TIMEOUT'] = 300
+# Server-side sessions in Redis when available, signed cookies otherwise
+if redis_url:
+    import redis
+    app.config['SESSION_TYPE'] = 'redis'
+    app.config['SESSION_REDIS'] = redis.from_url(redis_url)
+    app.config['SESSION_USE_SIGNER'] = True
 
 db = SQLAlchemy(app)
 
+# Development aid (DEBUG_QUERIES=1): report lazy relationship loads and per-request query counts
+if os.environ.get('DEBUG_QUERIES') and os.environ.get('FLASK_ENV') != 'production':
+    from flask import g, has_request_context
+    from sqlalchemy.orm import Session as OrmSession
+    
+    @event.listens_for(OrmSession, 'do_orm_execute')
+    def report_lazy_load(orm_execute_state):
+        if orm_execute_state.is_select and orm_execute_state.lazy_loaded_from is not None:
+            print(f"Lazy load from {orm_execute_state.lazy_loaded_from.class_.__name__}: "
+                  f"{' '.join(str(orm_execute_state.statement).split())}")
+    
+    @event.listens_for(Engine, 'before_cursor_execute')
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        if has_request_context():
+            g.query_count = g.get('query_count', 0) + 1
+    
+    @app.after_request
+    def report_query_count(response):
+        print(f"{request.method} {request.path}: {g.get('query_count', 0)} queries")
+        return response
+cache = Cache(app)
+if redis_url:
+    Session(app)
+
 # Initialize Socket.IO - use threading mode (compatible with Python 3.13)
-# Eventlet doesn't support Python 3.13, so we use threading mode everywhere
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
+# Eventlet doesn't support Python 3.13; gunicorn_config.py switches to gevent mode
+# With Redis, emits go through its pub/sub so every server process can broadcast to all clients
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode=os.environ.get('SOCKETIO_ASYNC_MODE', 'threading'),
+                    message_queue=redis_url)
 
 # Database Models
 class Team(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), nullable=False)
+    name = db.Column(db.String(100), unique=True, index=True, nullable=False)
     owner = db.Column(db.String(100), nullable=False)
     coowner_name = db.Column(db.String(100), nullable=True)
     batch = db.Column(db.String(50), nullable=False)
     price = db.Column(db.Float, default=0.0, nullable=False)
     number_of_members = db.Column(db.Integer, default=12, nullable=False)
     logo_filename = db.Column(db.String(255), nullable=True)
+    thumb_filename = db.Column(db.String(255), nullable=True)  # Small logo for the homepage
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 class AuctionSetting(db.Model):
@@ -57,13 +153,13 @@ class AuctionSetting(db.Model):
 class Admin(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(50), unique=True, nullable=False)
-    password = db.Column(db.String(100), nullable=False)
+    password = db.Column(db.String(255), nullable=False)
 
 class TeamUser(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    team_id = db.Column(db.Integer, db.ForeignKey('team.id'), nullable=False)
+    team_id = db.Column(db.Integer, db.ForeignKey('team.id'), index=True, nullable=False)
     username = db.Column(db.String(50), unique=True, nullable=False)
-    password = db.Column(db.String(100), nullable=False)
+    password = db.Column(db.String(255), nullable=False)
     team = db.relationship('Team', backref=db.backref('users', lazy=True))
 
 class SlotManagement(db.Model):
@@ -77,12 +173,18 @@ class SlotManagement(db.Model):
 class Player(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
-    batch = db.Column(db.String(50), nullable=False)
-    position = db.Column(db.String(50), nullable=False)
+    batch = db.Column(db.String(50), index=True, nullable=False)
+    position = db.Column(db.String(50), index=True, nullable=False)
     base_price = db.Column(db.Float, default=0.0, nullable=False)
     photo_filename = db.Column(db.String(255), nullable=True)
+    thumb_filename = db.Column(db.String(255), nullable=True)  # Small photo for the homepage
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Base price as a float, treating a missing value as 0
+    @property
+    def base_price_f(self):
+        return float(self.base_price or 0.0)
+
 # Many-to-many relationship table for Auction and Player
 auction_players = db.Table('auction_players',
     db.Column('auction_id', db.Integer, db.ForeignKey('auction.id'), primary_key=True),
@@ -97,7 +199,7 @@ class Auction(db.Model):
     sponsor = db.Column(db.String(200), nullable=True)
     status = db.Column(db.String(20), default='draft', nullable=False)  # draft, live, closed
     auction_setting_id = db.Column(db.Integer, db.ForeignKey('auction_setting.id'), nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Live auction state fields
@@ -108,16 +210,19 @@ class Auction(db.Model):
     
     # Relationships
     auction_setting = db.relationship('AuctionSetting', backref=db.backref('auctions', lazy=True))
-    players = db.relationship('Player', secondary=auction_players, lazy='subquery',
+    players = db.relationship('Player', secondary=auction_players,
                            backref=db.backref('auctions', lazy=True))
     current_player = db.relationship('Player', foreign_keys=[current_player_id], lazy=True)
     highest_bid_team = db.relationship('Team', foreign_keys=[highest_bid_team_id], lazy=True)
+    
+    # Live auction lookup filters on both columns
+    __table_args__ = (db.Index('ix_auction_live', 'is_live', 'status'),)
 
 class Bid(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     auction_id = db.Column(db.Integer, db.ForeignKey('auction.id'), nullable=False)
-    player_id = db.Column(db.Integer, db.ForeignKey('player.id'), nullable=False)
-    team_id = db.Column(db.Integer, db.ForeignKey('team.id'), nullable=False)
+    player_id = db.Column(db.Integer, db.ForeignKey('player.id'), nullable=False, index=True)
+    team_id = db.Column(db.Integer, db.ForeignKey('team.id'), nullable=False, index=True)
     bid_amount = db.Column(db.Float, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
@@ -125,6 +230,69 @@ class Bid(db.Model):
     auction = db.relationship('Auction', backref=db.backref('bids', lazy=True))
     player = db.relationship('Player', backref=db.backref('bids', lazy=True))
     team = db.relationship('Team', backref=db.backref('bids', lazy=True))
+    
+    # Team spending groups one auction/player's bids by team (also serves auction_id-only lookups)
+    __table_args__ = (db.Index('ix_bid_auction_player_team', 'auction_id', 'player_id', 'team_id'),)
+
+# Applied schema migration level (single row, id=1)
+class SchemaVersion(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, default=0, nullable=False)
+
+# Bump when adding a migration to migrate_schema() so existing databases run it once
+SCHEMA_VERSION = 5
+
+# Columns added after the first release, per table (ADD COLUMN DDL, in order)
+ADDED_COLUMNS = {
+    'team': [
+        ('coowner_name', 'VARCHAR(100)'),
+        ('price', 'FLOAT DEFAULT 0.0'),
+        ('number_of_members', 'INTEGER DEFAULT 12'),
+        ('logo_filename', 'VARCHAR(255)'),
+        ('thumb_filename', 'VARCHAR(255)'),
+    ],
+    'player': [
+        ('thumb_filename', 'VARCHAR(255)'),
+    ],
+    'slot_management': [
+        ('total_teams', 'INTEGER DEFAULT 12'),
+    ],
+    'auction_setting': [
+        ('auction_date', 'VARCHAR(100)'),
+        ('auction_place', 'VARCHAR(200)'),
+    ],
+    'auction': [
+        ('auction_setting_id', 'INTEGER'),
+        ('is_live', 'INTEGER DEFAULT 0'),  # SQLite uses INTEGER for boolean (0 or 1)
+        ('current_player_id', 'INTEGER'),
+        ('highest_bid', 'FLOAT DEFAULT 0.0'),
+        ('highest_bid_team_id', 'INTEGER'),
+    ],
+}
+
+# Socket.IO events are sent by one background task per process, in the order they were queued,
+# so the request returns without waiting on the emit and clients never see an older bid after a newer one
+broadcast_queue = queue.Queue()
+broadcast_task_lock = threading.Lock()
+broadcast_task_started = False
+
+def send_broadcasts():
+    while True:
+        event, data = broadcast_queue.get()
+        try:
+            socketio.emit(event, data, namespace='/')
+        except Exception as e:
+            print(f"Broadcast of {event} failed: {e}")
+
+# Helper function to queue a Socket.IO event for the broadcast task (started on first use, after the worker forks)
+def broadcast(event, data=None):
+    global broadcast_task_started
+    if not broadcast_task_started:
+        with broadcast_task_lock:
+            if not broadcast_task_started:
+                socketio.start_background_task(send_broadcasts)
+                broadcast_task_started = True
+    broadcast_queue.put((event, data))
 
 # Authentication decorators
 def admin_required(f):
@@ -145,46 +313,268 @@ def team_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+# Password hashing - pbkdf2 avoids scrypt's per-login memory cost, and an explicit iteration count
+# keeps each hash around 15 ms instead of werkzeug's 600k-iteration default blocking the worker
+PASSWORD_HASH_METHOD = 'pbkdf2:sha256:50000'
+USERNAME_STRIP_TABLE = str.maketrans('', '', ' ')
+TEAM_USERNAME_MAX_LENGTH = TeamUser.username.type.length
+
+def is_password_hash(stored_password):
+    return stored_password.startswith(('pbkdf2:', 'scrypt:'))
+
+# Helper function to compare a password against a stored hash (or legacy plaintext)
+def check_password(stored_password, password):
+    if is_password_hash(stored_password):
+        return check_password_hash(stored_password, password)
+    return hmac.compare_digest(stored_password.encode(), password.encode())
+
+# Helper function to tell whether a stored password already uses PASSWORD_HASH_METHOD
+def is_current_password_hash(stored_password):
+    return stored_password.startswith(PASSWORD_HASH_METHOD + '$')
+
+# Helper function to verify a user's password, upgrading plaintext or older hashes to PASSWORD_HASH_METHOD
+def verify_password(user, password):
+    if not check_password(user.password, password):
+        return False
+    if not is_current_password_hash(user.password):
+        user.password = generate_password_hash(password, method=PASSWORD_HASH_METHOD)
+        db.session.commit()
+    return True
+
+# Helper function to build a team's default user account
+# Default username is the team name in lowercase without spaces (cut to fit the column), default password is username + "123"
+def build_default_team_user(team):
+    username = team.name.lower().translate(USERNAME_STRIP_TABLE)[:TEAM_USERNAME_MAX_LENGTH]
+    return TeamUser(team_id=team.id, username=username,
+                    password=generate_password_hash(username + '123', method=PASSWORD_HASH_METHOD))
+
+# Helper function to make a taken default username unique by ending it with the team id
+def unique_team_username(username, team_id):
+    suffix = str(team_id)
+    return username[:TEAM_USERNAME_MAX_LENGTH - len(suffix)] + suffix
+
+# Helper function to tell whether an IntegrityError came from the unique team name index
+def is_team_name_conflict(error):
+    message = str(error.orig)
+    # PostgreSQL names the index, SQLite names the column
+    return 'ix_team_name' in message or 'team.name' in message
+
+# Helper function to give every team without a user account its default one (run by init_db)
+def provision_team_users():
+    teams = Team.query.outerjoin(TeamUser, TeamUser.team_id == Team.id).filter(TeamUser.id.is_(None)).all()
+    if not teams:
+        return
+    taken_usernames = {username for (username,) in db.session.query(TeamUser.username)}
+    for team in teams:
+        team_user = build_default_team_user(team)
+        # Another team may already use the default username; keep it unique with the team id
+        if team_user.username in taken_usernames:
+            team_user.username = unique_team_username(team_user.username, team.id)
+        taken_usernames.add(team_user.username)
+        db.session.add(team_user)
+
 # Helper function to check allowed file extensions
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return file_extension(filename) in ALLOWED_EXTENSIONS
 
-# Helper function to save uploaded file
-def save_team_logo(file):
+# Helper function to get the lowercase extension (without the dot) of a file name
+def file_extension(filename):
+    base, dot, ext = filename.rpartition('.')
+    if not dot or '/' in ext or '\\' in ext:
+        return ''
+    return ext.lower()
+
+# Copy buffer size for uploaded files (1 MiB)
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Helper function to write an uploaded file to disk in large chunks
+def save_upload_stream(file, file_path):
+    # Write to a .part file and rename it into place so a half-written upload is never served
+    part_path = f"{file_path}.part"
+    try:
+        with open(part_path, 'wb') as dst:
+            shutil.copyfileobj(file.stream, dst, UPLOAD_CHUNK_SIZE)
+        os.replace(part_path, file_path)
+    except Exception:
+        Path(part_path).unlink(missing_ok=True)
+        raise
+
+# Helper function to copy a file in the kernel: copy_file_range (can reflink on copy-on-write
+# filesystems) or sendfile where it is unavailable, with a 1 MiB buffered copy if either fails
+def fast_copy(src, dst):
+    # Windows has neither syscall; shutil.copy2 uses the native CopyFile2 there
+    if os.name == 'nt':
+        shutil.copy2(src, dst)
+        return
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        size = os.fstat(src_fd).st_size
+        copied = 0
+        try:
+            if hasattr(os, 'copy_file_range'):
+                while copied < size:
+                    count = os.copy_file_range(src_fd, dst_fd, size - copied, copied, copied)
+                    if count == 0:
+                        break
+                    copied += count
+            elif hasattr(os, 'sendfile'):
+                while copied < size:
+                    count = os.sendfile(dst_fd, src_fd, copied, size - copied)
+                    if count == 0:
+                        break
+                    copied += count
+        except OSError:
+            copied = 0
+        if copied < size:
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+            shutil.copyfileobj(fsrc, fdst, UPLOAD_CHUNK_SIZE)
+    shutil.copystat(src, dst)
+
+# Helper function to save an uploaded image under a unique filename
+def save_upload(file, upload_folder):
     if file and allowed_file(file.filename):
         # Generate unique filename
-        filename = secure_filename(file.filename)
-        unique_filename = f"{uuid.uuid4().hex}_{filename}"
-        
-        # Create upload directory if it doesn't exist
-        upload_folder = app.config['UPLOAD_FOLDER']
-        os.makedirs(upload_folder, exist_ok=True)
+        unique_filename = f"{secrets.token_hex(8)}_{secure_filename(file.filename)}"
         
         # Save file
-        file_path = os.path.join(upload_folder, unique_filename)
-        file.save(file_path)
+        save_upload_stream(file, os.path.join(upload_folder, unique_filename))
         return unique_filename
     return None
 
+# Helper function to save uploaded file
+def save_team_logo(file):
+    return save_upload(file, app.config['UPLOAD_FOLDER'])
+
 # Helper function to save player photo
 def save_player_photo(file):
-    if file and allowed_file(file.filename):
-        # Generate unique filename
-        filename = secure_filename(file.filename)
-        unique_filename = f"{uuid.uuid4().hex}_{filename}"
-        
-        # Create upload directory if it doesn't exist
-        upload_folder = app.config['PLAYER_PHOTO_FOLDER']
-        os.makedirs(upload_folder, exist_ok=True)
-        
-        # Save file
-        file_path = os.path.join(upload_folder, unique_filename)
-        file.save(file_path)
-        return unique_filename
+    return save_upload(file, app.config['PLAYER_PHOTO_FOLDER'])
+
+# Thumbnails are generated in the background after the upload response
+THUMBNAIL_SIZE = (256, 256)
+thumbnail_executor = ThreadPoolExecutor(max_workers=2)
+# Photo copies during bulk upload are I/O-bound and run in parallel
+photo_copy_executor = ThreadPoolExecutor(max_workers=8)
+
+def generate_thumbnail(file_path, thumb_path):
+    # Imported here so workers only load Pillow once they actually make a thumbnail
+    from PIL import Image
+    
+    try:
+        with Image.open(file_path) as image:
+            image.thumbnail(THUMBNAIL_SIZE)
+            image.save(thumb_path, optimize=True, quality=82)
+    except Exception as e:
+        print(f"Thumbnail generation failed for {file_path}: {e}")
+
+# Helper function to get the thumbnail filename for an uploaded image (SVGs get none)
+def thumbnail_filename(filename):
+    if not filename or filename.lower().endswith('.svg'):
+        return None
+    base, ext = os.path.splitext(filename)
+    return f"{base}_thumb{ext}"
+
+# Helper function to queue a thumbnail for an uploaded image, returns the thumbnail filename
+def schedule_thumbnail(upload_folder, filename):
+    thumb_filename = thumbnail_filename(filename)
+    if thumb_filename:
+        thumbnail_executor.submit(generate_thumbnail, os.path.join(upload_folder, filename),
+                                  os.path.join(upload_folder, thumb_filename))
+    return thumb_filename
+
+# Replaced/deleted upload files are unlinked in the background, off the request thread
+upload_cleanup_executor = ThreadPoolExecutor(max_workers=1)
+
+def unlink_uploads(upload_folder, filenames):
+    for filename in filenames:
+        try:
+            Path(upload_folder, filename).unlink(missing_ok=True)
+        except OSError:
+            pass
+
+# Helper function to queue uploaded files for deletion (missing files are ignored)
+def delete_uploads(upload_folder, *filenames):
+    filenames = [filename for filename in filenames if filename]
+    if filenames:
+        upload_cleanup_executor.submit(unlink_uploads, upload_folder, filenames)
+
+# Helper function to place a temp file at its final path: a hard link when both are on the same
+# filesystem (metadata only, and the temp file stays usable if another row matches it), else a copy
+def link_or_copy(src, dst):
+    try:
+        os.link(src, dst)
+    except OSError:
+        fast_copy(src, dst)
+
+# Helper function to yield the file entries under a directory (one scandir per directory, no extra stats)
+def iter_files(directory):
+    stack = [directory]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        yield entry
+        except OSError:
+            continue
+
+# Helper function to index photos in a directory by lowercase name and base name
+def build_photo_index(directory):
+    by_name = {}
+    by_base = {}
+    for entry in iter_files(directory):
+        file_lower = entry.name.lower()
+        by_name.setdefault(file_lower, entry.path)
+        by_base.setdefault(os.path.splitext(file_lower)[0], entry.path)
+    return by_name, by_base
+
+# Helper function to remove a bulk-upload temp directory (native rm -rf on POSIX, much faster for big trees)
+def remove_temp_dir(path):
+    if os.name == 'posix':
+        subprocess.run(['rm', '-rf', '--', path], check=False)
+    else:
+        shutil.rmtree(path, ignore_errors=True)
+
+# Helper function to add the image members of a photo ZIP to a photo index (nothing is extracted)
+def add_zip_to_photo_index(photo_index, zip_ref):
+    by_name, by_base = photo_index
+    for member in zip_ref.infolist():
+        if member.is_dir() or not allowed_file(member.filename):
+            continue
+        file_lower = member.filename.rpartition('/')[2].lower()
+        by_name.setdefault(file_lower, member)
+        by_base.setdefault(os.path.splitext(file_lower)[0], member)
+
+# Helper function to write a single ZIP member to a file
+def extract_zip_member(zip_ref, member, dst):
+    with zip_ref.open(member) as src, open(dst, 'wb') as out:
+        shutil.copyfileobj(src, out, UPLOAD_CHUNK_SIZE)
+
+# Helper function to resolve a photo name against a photo index (case-insensitive)
+def find_photo(photo_index, photo_name):
+    by_name, by_base = photo_index
+    photo_name_lower = photo_name.lower()
+    
+    # First try exact match, then match on filename without extension
+    photo_path = by_name.get(photo_name_lower)
+    if photo_path:
+        return photo_path
+    photo_name_base = os.path.splitext(photo_name_lower)[0]
+    photo_path = by_base.get(photo_name_base)
+    if photo_path:
+        return photo_path
+    
+    # If still not found, try contains match
+    for file_lower, file_path in by_name.items():
+        if photo_name_base in file_lower or file_lower in photo_name_base:
+            return file_path
     return None
 
 # Football positions list
-FOOTBALL_POSITIONS = [
+FOOTBALL_POSITIONS = (
     'Goalkeeper (GK)',
     'Right Back (RB)',
     'Left Back (LB)',
@@ -199,10 +589,89 @@ FOOTBALL_POSITIONS = [
     'Striker (ST)',
     'Center Forward (CF)',
     'Second Striker (SS)'
-]
+)
+FOOTBALL_POSITIONS_SET = frozenset(FOOTBALL_POSITIONS)
+
+# Default settings bootstrap - runs once per process instead of on every request
+_defaults_initialized = False
+
+# Helper function to check whether a query matches any row (SELECT EXISTS, no object loading)
+def row_exists(query):
+    return db.session.query(query.exists()).scalar()
+
+# Helper function to insert a default row with id=1 unless it already exists (one statement, no probe)
+def insert_default_row(model, **values):
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        stmt = pg_insert(model)
+    elif dialect == 'sqlite':
+        stmt = sqlite_insert(model)
+    else:
+        if db.session.get(model, 1) is None:
+            db.session.add(model(id=1, **values))
+        return
+    result = db.session.execute(stmt.values(id=1, **values).on_conflict_do_nothing(index_elements=['id']))
+    if dialect == 'postgresql' and result.rowcount:
+        # An explicit id does not advance the serial sequence, so move it past the seeded row
+        table = model.__tablename__
+        db.session.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"
+        ))
+
+# Default auction setting: Saturday December 14, 2025 at 10:00 AM
+DEFAULT_AUCTION_START_TIME = datetime(2025, 12, 14, 10, 0, 0)
+DEFAULT_AUCTION_DATE = "Saturday, December 14, 2025"
+DEFAULT_AUCTION_PLACE = "Main Auditorium"
+
+# Helper function to seed the singleton slot and auction setting rows
+def insert_default_settings():
+    insert_default_row(SlotManagement, total_slots=12, total_teams=12, filled_slots=0, remaining_slots=12)
+    insert_default_row(
+        AuctionSetting,
+        auction_start_time=DEFAULT_AUCTION_START_TIME,
+        auction_date=DEFAULT_AUCTION_DATE,
+        auction_place=DEFAULT_AUCTION_PLACE
+    )
+
+def ensure_default_settings():
+    global _defaults_initialized
+    if _defaults_initialized:
+        return
+    
+    insert_default_settings()
+    db.session.commit()
+    _defaults_initialized = True
+
+@app.before_request
+def init_defaults_once():
+    if not _defaults_initialized:
+        ensure_default_settings()
+
+# Helper function to sync slot counts, only writing when they actually changed
+def sync_slot_info(slot_info, team_count):
+    remaining_slots = slot_info.total_slots - team_count
+    if slot_info.filled_slots != team_count or slot_info.remaining_slots != remaining_slots:
+        slot_info.filled_slots = team_count
+        slot_info.remaining_slots = remaining_slots
+        db.session.commit()
+
+# Helper function to shift filled/remaining slots by a team count delta in the current transaction
+# (a relative UPDATE, so concurrent team changes cannot overwrite each other's counts)
+def adjust_slot_counts(delta):
+    db.session.execute(update(SlotManagement).values(
+        filled_slots=SlotManagement.filled_slots + delta,
+        remaining_slots=SlotManagement.remaining_slots - delta
+    ))
+
+# Rendered homepage is cached for anonymous visitors (no login state or pending flashes)
+HOME_CACHE_KEY = 'home_page'
+
+def invalidate_home_cache():
+    cache.delete(HOME_CACHE_KEY)
 
 # Routes
 @app.route('/')
+@cache.cached(timeout=60, key_prefix=HOME_CACHE_KEY, unless=lambda: bool(session))
 def home():
     teams = Team.query.all()
     team_count = len(teams)
@@ -212,31 +681,12 @@ def home():
     # Check for live auction
     live_auction = Auction.query.filter_by(is_live=True, status='live').first()
     
-    # Get slot information
+    # Get slot information and update filled slots based on actual teams
     slot_info = SlotManagement.query.first()
-    if not slot_info:
-        slot_info = SlotManagement(total_slots=12, total_teams=12, filled_slots=0, remaining_slots=12)
-        db.session.add(slot_info)
-        db.session.commit()
-    
-    # Update filled slots based on actual teams
-    slot_info.filled_slots = team_count
-    slot_info.remaining_slots = slot_info.total_slots - team_count
-    db.session.commit()
+    sync_slot_info(slot_info, team_count)
     
     # Get auction settings from database
     auction_setting = AuctionSetting.query.first()
-    if not auction_setting:
-        # Default: Saturday December 14, 2025 at 10:00 AM
-        countdown_time = datetime(2025, 12, 14, 10, 0, 0)
-        auction_setting = AuctionSetting(
-            auction_start_time=countdown_time,
-            auction_date="Saturday, December 14, 2025",
-            auction_place="Main Auditorium"
-        )
-        db.session.add(auction_setting)
-        db.session.commit()
-    
     countdown_time = auction_setting.auction_start_time
     
     return render_template('index.html', teams=teams, team_count=team_count, 
@@ -244,11 +694,16 @@ def home():
                          players=players, player_count=player_count,
                          auction_setting=auction_setting, live_auction=live_auction)
 
+# Cached auction start time - every home page view fetches the countdown
+@cache.memoize(timeout=300)
+def get_auction_start_time():
+    auction_setting = AuctionSetting.query.first()
+    return auction_setting.auction_start_time if auction_setting else None
+
 @app.route('/api/countdown')
 def get_countdown():
-    auction_setting = AuctionSetting.query.first()
-    if auction_setting:
-        countdown_time = auction_setting.auction_start_time
+    countdown_time = get_auction_start_time()
+    if countdown_time:
         now = datetime.utcnow()
         if countdown_time > now:
             time_left = countdown_time - now
@@ -265,10 +720,10 @@ def get_countdown():
 def admin_login():
     if request.method == 'POST':
         username = request.form.get('username')
-        password = request.form.get('password')
+        password = request.form.get('password') or ''
         
         admin = Admin.query.filter_by(username=username).first()
-        if admin and admin.password == password:
+        if admin and verify_password(admin, password):
             session['admin_logged_in'] = True
             session['admin_username'] = username
             flash('Admin login successful!', 'success')
@@ -286,81 +741,105 @@ def admin_logout():
     flash('Admin logged out successfully', 'success')
     return redirect(url_for('home'))
 
+# Cached team login lookup: team name -> (team id, team name, password hash)
+@cache.memoize(timeout=60)
+def get_team_credentials(team_name):
+    return db.session.query(Team.id, Team.name, TeamUser.password).join(
+        TeamUser, TeamUser.team_id == Team.id
+    ).filter(Team.name == team_name).first()
+
 @app.route('/team/login', methods=['GET', 'POST'])
 def team_login():
     if request.method == 'POST':
-        team_name = request.form.get('team_name')
-        password = request.form.get('password')
-        
-        # Find team by name
-        team = Team.query.filter_by(name=team_name).first()
-        if team:
-            # Check if team has a user account
-            team_user = TeamUser.query.filter_by(team_id=team.id).first()
-            if team_user and team_user.password == password:
+        team_name = request.form.get('team_name') or ''
+        password = request.form.get('password') or ''
+        
+        # Find team and its user account by name
+        credentials = get_team_credentials(team_name)
+        if credentials:
+            team_id, name, stored_password = credentials
+            if is_current_password_hash(stored_password):
+                valid = check_password(stored_password, password)
+            else:
+                # Plaintext or older hash: verify through the account row so it gets upgraded
+                valid = verify_password(TeamUser.query.filter_by(team_id=team_id).first(), password)
+                if valid:
+                    cache.delete_memoized(get_team_credentials, team_name)
+            if valid:
                 session['team_logged_in'] = True
-                session['team_id'] = team.id
-                session['team_name'] = team.name
+                session['team_id'] = team_id
+                session['team_name'] = name
                 flash('Team login successful!', 'success')
-                return redirect(url_for('team_dashboard', team_id=team.id))
-            elif not team_user:
-                # Create default password for team if no user exists
-                # Default password is team name in lowercase + "123"
-                default_password = team_name.lower().replace(' ', '') + '123'
-                if password == default_password:
-                    # Create team user
-                    new_team_user = TeamUser(team_id=team.id, username=team_name.lower().replace(' ', ''), password=default_password)
-                    db.session.add(new_team_user)
-                    db.session.commit()
-                    session['team_logged_in'] = True
-                    session['team_id'] = team.id
-                    session['team_name'] = team.name
-                    flash('Team login successful!', 'success')
-                    return redirect(url_for('team_dashboard', team_id=team.id))
+                return redirect(url_for('team_dashboard', team_id=team_id))
         
         flash('Invalid team name or password', 'error')
     
     return render_template('team_login.html')
 
+# Players shown per page on the admin dashboard
+PLAYERS_PER_PAGE = 100
+
+# Helper function to load one page of players with only the columns the dashboard shows
+def get_players_page(page):
+    return Player.query.options(
+        load_only(Player.id, Player.name, Player.batch, Player.position, Player.base_price, Player.photo_filename)
+    ).order_by(Player.id).offset((page - 1) * PLAYERS_PER_PAGE).limit(PLAYERS_PER_PAGE).all()
+
+# Auctions listed per admin dashboard page
+AUCTIONS_PER_PAGE = 50
+
 @app.route('/admin/dashboard')
 @admin_required
 def admin_dashboard():
     teams = Team.query.all()
-    players = Player.query.all()
-    auctions = Auction.query.order_by(Auction.created_at.desc()).all()
+    players = get_players_page(1)
+    player_count = db.session.query(func.count(Player.id)).scalar()
+    # Newest auctions first, one page at a time (one extra row tells whether an older page exists)
+    auction_page = max(request.args.get('auction_page', 1, type=int), 1)
+    auctions = Auction.query.order_by(Auction.created_at.desc()).offset(
+        (auction_page - 1) * AUCTIONS_PER_PAGE).limit(AUCTIONS_PER_PAGE + 1).all()
+    has_older_auctions = len(auctions) > AUCTIONS_PER_PAGE
+    auctions = auctions[:AUCTIONS_PER_PAGE]
+    # Only the number of players per auction is shown, so count them instead of loading the rows
+    auction_player_counts = dict(db.session.query(
+        auction_players.c.auction_id, func.count(auction_players.c.player_id)
+    ).filter(auction_players.c.auction_id.in_([auction.id for auction in auctions])).group_by(
+        auction_players.c.auction_id).all()) if auctions else {}
     auction_setting = AuctionSetting.query.first()
     slot_info = SlotManagement.query.first()
-    if not slot_info:
-        slot_info = SlotManagement(total_slots=12, total_teams=12, filled_slots=len(teams), remaining_slots=12-len(teams))
-        db.session.add(slot_info)
-        db.session.commit()
-    else:
-        slot_info.filled_slots = len(teams)
-        slot_info.remaining_slots = slot_info.total_slots - len(teams)
-        db.session.commit()
-    return render_template('admin_dashboard.html', teams=teams, players=players, auctions=auctions, auction_setting=auction_setting, slot_info=slot_info)
+    sync_slot_info(slot_info, len(teams))
+    return render_template('admin_dashboard.html', teams=teams, players=players, player_count=player_count,
+                         players_per_page=PLAYERS_PER_PAGE, auctions=auctions,
+                         auction_page=auction_page, has_older_auctions=has_older_auctions,
+                         auction_player_counts=auction_player_counts,
+                         auction_setting=auction_setting, slot_info=slot_info)
+
+@app.route('/admin/players')
+@admin_required
+def get_players():
+    page = request.args.get('page', 1, type=int)
+    players = get_players_page(max(page, 1))
+    return jsonify([{
+        'id': player.id,
+        'name': player.name,
+        'batch': player.batch,
+        'position': player.position,
+        'base_price': player.base_price,
+        'photo_filename': player.photo_filename
+    } for player in players])
 
 @app.route('/admin/settings', methods=['GET', 'POST'])
 @admin_required
 def admin_settings():
     slot_info = SlotManagement.query.first()
     auction_setting = AuctionSetting.query.first()
-    auctions = Auction.query.all()
+    auctions = Auction.query.options(joinedload(Auction.auction_setting)).all()
     
-    if not slot_info:
-        slot_info = SlotManagement(total_slots=12, total_teams=12, filled_slots=0, remaining_slots=12)
-        db.session.add(slot_info)
-        db.session.commit()
-    
-    if not auction_setting:
-        default_time = datetime(2025, 12, 14, 10, 0, 0)
-        auction_setting = AuctionSetting(
-            auction_start_time=default_time,
-            auction_date="Saturday, December 14, 2025",
-            auction_place="Main Auditorium"
-        )
-        db.session.add(auction_setting)
+    if not slot_info or not auction_setting:
+        insert_default_settings()
         db.session.commit()
+        slot_info = SlotManagement.query.first()
+        auction_setting = AuctionSetting.query.first()
     
     if request.method == 'POST':
         # Update slot management
@@ -371,8 +850,7 @@ def admin_settings():
             slot_info.total_slots = int(total_slots) if total_slots else 12
             slot_info.total_teams = int(total_teams) if total_teams else 12
             # Recalculate remaining slots
-            teams = Team.query.all()
-            slot_info.filled_slots = len(teams)
+            slot_info.filled_slots = db.session.query(func.count(Team.id)).scalar()
             slot_info.remaining_slots = slot_info.total_slots - slot_info.filled_slots
             db.session.commit()
         except ValueError:
@@ -384,64 +862,61 @@ def admin_settings():
         auction_time = request.form.get('auction_time')
         auction_place = request.form.get('auction_place')
         
+        # Parse date and time once for whichever setting gets updated
+        countdown_time = None
+        date_error = 'Please provide both date and time'
+        if auction_date and auction_time:
+            try:
+                countdown_time = datetime.fromisoformat(f"{auction_date}T{auction_time}")
+            except ValueError:
+                date_error = 'Invalid date or time format'
+        
         # If an auction is selected, update that auction's setting
         if selected_auction_id:
             selected_auction = Auction.query.get(int(selected_auction_id))
             if selected_auction:
                 if not selected_auction.auction_setting_id:
                     # Create new auction setting for this auction
-                    if auction_date and auction_time:
-                        try:
-                            date_time_str = f"{auction_date} {auction_time}"
-                            countdown_time = datetime.strptime(date_time_str, "%Y-%m-%d %H:%M")
-                            new_setting = AuctionSetting(
-                                auction_start_time=countdown_time,
-                                auction_date=auction_date,
-                                auction_place=auction_place or "Main Auditorium"
-                            )
-                            db.session.add(new_setting)
-                            db.session.flush()
-                            selected_auction.auction_setting_id = new_setting.id
-                            db.session.commit()
-                            flash('Auction settings updated successfully!', 'success')
-                        except ValueError:
-                            flash('Invalid date or time format', 'error')
+                    if countdown_time:
+                        new_setting = AuctionSetting(
+                            auction_start_time=countdown_time,
+                            auction_date=auction_date,
+                            auction_place=auction_place or DEFAULT_AUCTION_PLACE
+                        )
+                        db.session.add(new_setting)
+                        db.session.flush()
+                        selected_auction.auction_setting_id = new_setting.id
+                        db.session.commit()
+                        flash('Auction settings updated successfully!', 'success')
                     else:
-                        flash('Please provide both date and time', 'error')
+                        flash(date_error, 'error')
                 else:
                     # Update existing setting
                     setting = AuctionSetting.query.get(selected_auction.auction_setting_id)
-                    if setting and auction_date and auction_time:
-                        try:
-                            date_time_str = f"{auction_date} {auction_time}"
-                            countdown_time = datetime.strptime(date_time_str, "%Y-%m-%d %H:%M")
-                            setting.auction_start_time = countdown_time
-                            setting.auction_date = auction_date
-                            setting.auction_place = auction_place or "Main Auditorium"
-                            db.session.commit()
-                            flash('Auction settings updated successfully!', 'success')
-                        except ValueError:
-                            flash('Invalid date or time format', 'error')
+                    if setting and countdown_time:
+                        setting.auction_start_time = countdown_time
+                        setting.auction_date = auction_date
+                        setting.auction_place = auction_place or DEFAULT_AUCTION_PLACE
+                        db.session.commit()
+                        flash('Auction settings updated successfully!', 'success')
                     else:
-                        flash('Please provide both date and time', 'error')
+                        flash(date_error, 'error')
         else:
             # Update default auction settings
-            if auction_date and auction_time:
-                try:
-                    # Parse date and time
-                    date_time_str = f"{auction_date} {auction_time}"
-                    countdown_time = datetime.strptime(date_time_str, "%Y-%m-%d %H:%M")
-                    
-                    auction_setting.auction_start_time = countdown_time
-                    auction_setting.auction_date = auction_date
-                    auction_setting.auction_place = auction_place or "Main Auditorium"
-                    db.session.commit()
-                    
-                    flash('Settings updated successfully!', 'success')
-                except ValueError:
-                    flash('Invalid date or time format', 'error')
+            if countdown_time:
+                auction_setting.auction_start_time = countdown_time
+                auction_setting.auction_date = auction_date
+                auction_setting.auction_place = auction_place or DEFAULT_AUCTION_PLACE
+                db.session.commit()
+                
+                flash('Settings updated successfully!', 'success')
             else:
-                flash('Please provide both date and time', 'error')
+                flash(date_error, 'error')
+        
+        # Invalidate cached countdown time and homepage, and tell open home pages to re-sync their countdown
+        cache.delete_memoized(get_auction_start_time)
+        invalidate_home_cache()
+        broadcast('countdown_updated')
         
         return redirect(url_for('admin_settings'))
     
@@ -501,12 +976,6 @@ def add_team():
             flash('Team name, owner name, and batch are required', 'error')
             return redirect(url_for('add_team'))
         
-        # Check if team name already exists
-        existing_team = Team.query.filter_by(name=name).first()
-        if existing_team:
-            flash('Team name already exists', 'error')
-            return redirect(url_for('add_team'))
-        
         try:
             price = float(price) if price else 0.0
         except ValueError:
@@ -525,17 +994,35 @@ def add_team():
             batch=batch,
             price=price,
             number_of_members=number_of_members,
-            logo_filename=logo_filename
+            logo_filename=logo_filename,
+            thumb_filename=thumbnail_filename(logo_filename)
         )
         db.session.add(new_team)
-        db.session.commit()
-        
-        # Update slot management
-        slot_info = SlotManagement.query.first()
-        if slot_info:
-            slot_info.filled_slots = Team.query.count()
-            slot_info.remaining_slots = slot_info.total_slots - slot_info.filled_slots
+        try:
+            db.session.flush()
+            team_user = build_default_team_user(new_team)
+            # Another team may already use the default username; keep it unique with the team id
+            if row_exists(TeamUser.query.filter_by(username=team_user.username)):
+                team_user.username = unique_team_username(team_user.username, new_team.id)
+            db.session.add(team_user)
+            # Update slot management
+            adjust_slot_counts(1)
             db.session.commit()
+        except (IntegrityError, DataError) as e:
+            # DataError: a value too long for its column (PostgreSQL enforces VARCHAR lengths)
+            db.session.rollback()
+            # The logo was saved before the insert, so don't leave it behind
+            delete_uploads(app.config['UPLOAD_FOLDER'], logo_filename)
+            if isinstance(e, DataError):
+                flash('Team details are too long', 'error')
+            elif is_team_name_conflict(e):
+                flash('Team name already exists', 'error')
+            else:
+                flash('Could not add team, please try again', 'error')
+            return redirect(url_for('add_team'))
+        # Generate the thumbnail only once the team is saved
+        schedule_thumbnail(app.config['UPLOAD_FOLDER'], logo_filename)
+        invalidate_team_cache()
         
         flash('Team added successfully!', 'success')
         return redirect(url_for('admin_dashboard'))
@@ -561,24 +1048,21 @@ def edit_team(team_id):
             logo_file = request.files['logo']
             if logo_file and logo_file.filename:
                 # Delete old logo if exists
-                if team.logo_filename:
-                    old_logo_path = os.path.join(app.config['UPLOAD_FOLDER'], team.logo_filename)
-                    if os.path.exists(old_logo_path):
-                        os.remove(old_logo_path)
+                delete_uploads(app.config['UPLOAD_FOLDER'], team.logo_filename, team.thumb_filename)
                 
                 # Save new logo
                 logo_filename = save_team_logo(logo_file)
                 if logo_filename:
                     team.logo_filename = logo_filename
+                    team.thumb_filename = schedule_thumbnail(app.config['UPLOAD_FOLDER'], logo_filename)
                 elif not logo_filename:
                     flash('Invalid logo file. Allowed formats: PNG, JPG, JPEG, GIF, WEBP, SVG', 'error')
         
         # Handle logo deletion
         if delete_logo and team.logo_filename:
-            old_logo_path = os.path.join(app.config['UPLOAD_FOLDER'], team.logo_filename)
-            if os.path.exists(old_logo_path):
-                os.remove(old_logo_path)
+            delete_uploads(app.config['UPLOAD_FOLDER'], team.logo_filename, team.thumb_filename)
             team.logo_filename = None
+            team.thumb_filename = None
         
         # Validate required fields
         if not name or not owner or not batch:
@@ -586,8 +1070,7 @@ def edit_team(team_id):
             return redirect(url_for('edit_team', team_id=team_id))
         
         # Check if team name already exists (excluding current team)
-        existing_team = Team.query.filter_by(name=name).first()
-        if existing_team and existing_team.id != team_id:
+        if row_exists(Team.query.filter(Team.name == name, Team.id != team_id)):
             flash('Team name already exists', 'error')
             return redirect(url_for('edit_team', team_id=team_id))
         
@@ -609,6 +1092,7 @@ def edit_team(team_id):
         team.price = price
         team.number_of_members = number_of_members
         db.session.commit()
+        invalidate_team_cache()
         
         flash('Team updated successfully!', 'success')
         return redirect(url_for('admin_dashboard'))
@@ -621,40 +1105,57 @@ def delete_team(team_id):
     team = Team.query.get_or_404(team_id)
     
     # Delete team logo if exists
-    if team.logo_filename:
-        logo_path = os.path.join(app.config['UPLOAD_FOLDER'], team.logo_filename)
-        if os.path.exists(logo_path):
-            try:
-                os.remove(logo_path)
-            except:
-                pass
+    delete_uploads(app.config['UPLOAD_FOLDER'], team.logo_filename, team.thumb_filename)
     
     # Delete associated team users
     TeamUser.query.filter_by(team_id=team_id).delete()
     
-    # Delete team
+    # Delete team and update slot management
     db.session.delete(team)
+    adjust_slot_counts(-1)
     db.session.commit()
-    
-    # Update slot management
-    slot_info = SlotManagement.query.first()
-    if slot_info:
-        slot_info.filled_slots = Team.query.count()
-        slot_info.remaining_slots = slot_info.total_slots - slot_info.filled_slots
-        db.session.commit()
+    invalidate_team_cache()
     
     flash('Team deleted successfully!', 'success')
     return redirect(url_for('admin_dashboard'))
 
+# Cached /api/teams body and its ETag
+@cache.memoize(timeout=60)
+def get_teams_payload():
+    rows = db.session.query(Team.id, Team.name, Team.owner, Team.batch).all()
+    body = json.dumps([dict(zip(('id', 'name', 'owner', 'batch'), row)) for row in rows])
+    # blake2b is built into Python, so the ETag digest also works on FIPS hosts that block md5
+    return body, hashlib.blake2b(body.encode(), digest_size=16).hexdigest()
+
+# Helper function to drop cached team data after teams change
+def invalidate_team_cache():
+    cache.delete_memoized(get_team_credentials)
+    cache.delete_memoized(get_teams_payload)
+    invalidate_home_cache()
+
 @app.route('/api/teams')
 def get_teams():
-    teams = Team.query.all()
-    return jsonify([{
-        'id': team.id,
-        'name': team.name,
-        'owner': team.owner,
-        'batch': team.batch
-    } for team in teams])
+    body, etag = get_teams_payload()
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+# Uploaded images - every upload gets a new random filename, so they can be cached forever
+UPLOAD_FOLDERS = {
+    'team_logos': app.config['UPLOAD_FOLDER'],
+    'player_photos': app.config['PLAYER_PHOTO_FOLDER']
+}
+UPLOAD_MAX_AGE = 365 * 24 * 60 * 60
+
+@app.route('/uploads/<folder>/<path:filename>')
+def uploaded_file(folder, filename):
+    if folder not in UPLOAD_FOLDERS:
+        abort(404)
+    # Uploads are saved relative to the working directory, not the app root
+    response = send_from_directory(os.path.abspath(UPLOAD_FOLDERS[folder]), filename, max_age=UPLOAD_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
 
 # Player Management Routes
 @app.route('/admin/player/add', methods=['GET', 'POST'])
@@ -680,6 +1181,10 @@ def add_player():
             flash('Player name, batch, and position are required', 'error')
             return redirect(url_for('add_player'))
         
+        if position not in FOOTBALL_POSITIONS_SET:
+            flash('Invalid position', 'error')
+            return redirect(url_for('add_player'))
+        
         try:
             base_price = float(base_price) if base_price else 0.0
         except ValueError:
@@ -691,10 +1196,12 @@ def add_player():
             batch=batch,
             position=position,
             base_price=base_price,
-            photo_filename=photo_filename
+            photo_filename=photo_filename,
+            thumb_filename=schedule_thumbnail(app.config['PLAYER_PHOTO_FOLDER'], photo_filename)
         )
         db.session.add(new_player)
         db.session.commit()
+        invalidate_home_cache()
         
         flash('Player added successfully!', 'success')
         return redirect(url_for('admin_dashboard'))
@@ -718,30 +1225,32 @@ def edit_player(player_id):
             photo_file = request.files['photo']
             if photo_file and photo_file.filename:
                 # Delete old photo if exists
-                if player.photo_filename:
-                    old_photo_path = os.path.join(app.config['PLAYER_PHOTO_FOLDER'], player.photo_filename)
-                    if os.path.exists(old_photo_path):
-                        os.remove(old_photo_path)
+                delete_uploads(app.config['PLAYER_PHOTO_FOLDER'], player.photo_filename, player.thumb_filename)
                 
                 # Save new photo
                 photo_filename = save_player_photo(photo_file)
                 if photo_filename:
                     player.photo_filename = photo_filename
+                    player.thumb_filename = schedule_thumbnail(app.config['PLAYER_PHOTO_FOLDER'], photo_filename)
                 elif not photo_filename:
                     flash('Invalid photo file. Allowed formats: PNG, JPG, JPEG, GIF, WEBP, SVG', 'error')
         
         # Handle photo deletion
         if delete_photo and player.photo_filename:
-            old_photo_path = os.path.join(app.config['PLAYER_PHOTO_FOLDER'], player.photo_filename)
-            if os.path.exists(old_photo_path):
-                os.remove(old_photo_path)
+            delete_uploads(app.config['PLAYER_PHOTO_FOLDER'], player.photo_filename, player.thumb_filename)
             player.photo_filename = None
+            player.thumb_filename = None
         
         # Validate required fields
         if not name or not batch or not position:
             flash('Player name, batch, and position are required', 'error')
             return redirect(url_for('edit_player', player_id=player_id))
         
+        # Positions imported via bulk upload may be outside the list; keep them if unchanged
+        if position not in FOOTBALL_POSITIONS_SET and position != player.position:
+            flash('Invalid position', 'error')
+            return redirect(url_for('edit_player', player_id=player_id))
+        
         try:
             base_price = float(base_price) if base_price else 0.0
         except ValueError:
@@ -753,6 +1262,7 @@ def edit_player(player_id):
         player.position = position
         player.base_price = base_price
         db.session.commit()
+        invalidate_home_cache()
         
         flash('Player updated successfully!', 'success')
         return redirect(url_for('admin_dashboard'))
@@ -765,209 +1275,269 @@ def delete_player(player_id):
     player = Player.query.get_or_404(player_id)
     
     # Delete player photo if exists
-    if player.photo_filename:
-        photo_path = os.path.join(app.config['PLAYER_PHOTO_FOLDER'], player.photo_filename)
-        if os.path.exists(photo_path):
-            try:
-                os.remove(photo_path)
-            except:
-                pass
+    delete_uploads(app.config['PLAYER_PHOTO_FOLDER'], player.photo_filename, player.thumb_filename)
     
     # Delete player
     db.session.delete(player)
     db.session.commit()
+    invalidate_home_cache()
     
     flash('Player deleted successfully!', 'success')
     return redirect(url_for('admin_dashboard'))
 
-@app.route('/admin/player/bulk-upload', methods=['GET', 'POST'])
-@admin_required
-def bulk_upload_players():
-    if request.method == 'POST':
-        excel_file = request.files.get('excel_file')
-        photos_folder = request.files.getlist('photos_folder')
-        photos_zip = request.files.get('photos_zip')
-        
-        if not excel_file or excel_file.filename == '':
-            flash('Please upload an Excel file', 'error')
-            return redirect(url_for('bulk_upload_players'))
-        
-        # Create temporary directory for photos
-        temp_photos_dir = os.path.join('static', 'temp_photos', uuid.uuid4().hex)
-        os.makedirs(temp_photos_dir, exist_ok=True)
-        
+# Bulk uploads are processed off the request thread; job status lives in the cache
+bulk_upload_executor = ThreadPoolExecutor(max_workers=1)
+BULK_UPLOAD_JOB_TIMEOUT = 60 * 60
+
+# Number of error messages reported back for a bulk upload
+BULK_UPLOAD_MAX_ERRORS = 5
+
+def set_bulk_upload_status(job_id, **status):
+    cache.set(f'bulk_upload:{job_id}', status, timeout=BULK_UPLOAD_JOB_TIMEOUT)
+
+# Background task: parse the saved Excel file, copy matched photos and insert players
+def process_bulk_upload(job_id, temp_dir, excel_path):
+    import zipfile
+    from openpyxl import load_workbook
+    
+    with app.app_context():
+        photo_zip = None
         try:
-            # Handle zip file upload
-            if photos_zip and photos_zip.filename:
-                if photos_zip.filename.endswith('.zip'):
-                    zip_path = os.path.join(temp_photos_dir, 'photos.zip')
-                    photos_zip.save(zip_path)
-                    
-                    # Extract zip file
-                    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                        zip_ref.extractall(temp_photos_dir)
-                    os.remove(zip_path)
-            
-            # Handle multiple file uploads
-            if photos_folder:
-                for photo_file in photos_folder:
-                    if photo_file and photo_file.filename:
-                        filename = secure_filename(photo_file.filename)
-                        photo_path = os.path.join(temp_photos_dir, filename)
-                        photo_file.save(photo_path)
+            # Index uploaded photos once instead of walking the directory per row
+            photo_index = build_photo_index(os.path.join(temp_dir, 'photos'))
+            # Photos in the ZIP are indexed by name; only the ones a row uses get extracted
+            zip_path = os.path.join(temp_dir, 'photos.zip')
+            if os.path.exists(zip_path):
+                photo_zip = zipfile.ZipFile(zip_path, 'r')
+                add_zip_to_photo_index(photo_index, photo_zip)
             
             # Read Excel file
             try:
-                workbook = load_workbook(excel_file, data_only=True)
+                workbook = load_workbook(excel_path, data_only=True, read_only=True)
                 sheet = workbook.active
             except Exception as e:
-                flash(f'Error reading Excel file: {str(e)}', 'error')
-                shutil.rmtree(temp_photos_dir, ignore_errors=True)
-                return redirect(url_for('bulk_upload_players'))
+                set_bulk_upload_status(job_id, status='failed', message=f'Error reading Excel file: {str(e)}')
+                return
             
             # Get header row (first row)
             headers = []
-            for cell in sheet[1]:
-                headers.append(str(cell.value).lower().strip() if cell.value else '')
+            for value in next(sheet.iter_rows(min_row=1, max_row=1, values_only=True), ()):
+                headers.append(str(value).lower().strip() if value else '')
+            
+            # Map each header to its column index once (the first occurrence wins, like list.index)
+            col_idx = {}
+            for i, header in enumerate(headers):
+                col_idx.setdefault(header, i)
             
             # Validate required columns
             required_columns = ['player_name', 'batch', 'position']
-            missing_columns = [col for col in required_columns if col.lower() not in headers]
+            missing_columns = [col for col in required_columns if col not in col_idx]
             if missing_columns:
-                flash(f'Missing required columns in Excel: {", ".join(missing_columns)}', 'error')
-                shutil.rmtree(temp_photos_dir, ignore_errors=True)
-                return redirect(url_for('bulk_upload_players'))
+                workbook.close()
+                set_bulk_upload_status(job_id, status='failed',
+                                       message=f'Missing required columns in Excel: {", ".join(missing_columns)}')
+                return
             
             # Get column indices
-            player_name_idx = headers.index('player_name') if 'player_name' in headers else -1
-            batch_idx = headers.index('batch') if 'batch' in headers else -1
-            position_idx = headers.index('position') if 'position' in headers else -1
-            base_price_idx = headers.index('base_price') if 'base_price' in headers else -1
-            photo_name_idx = headers.index('photo_name') if 'photo_name' in headers else -1
+            player_name_idx = col_idx.get('player_name', -1)
+            batch_idx = col_idx.get('batch', -1)
+            position_idx = col_idx.get('position', -1)
+            base_price_idx = col_idx.get('base_price', -1)
+            photo_name_idx = col_idx.get('photo_name', -1)
             
             # Process each row
             success_count = 0
             error_count = 0
             errors = []
+            error_total = 0
+            
+            # Only the first few error messages are shown, so only those are kept
+            def add_error(message):
+                nonlocal error_total
+                error_total += 1
+                if len(errors) < BULK_UPLOAD_MAX_ERRORS:
+                    errors.append(message)
+            players_to_add = []
+            photo_copies = []
+            photo_folder = app.config['PLAYER_PHOTO_FOLDER']
+            # One random prefix per job; the Excel row number keeps names unique within it
+            photo_name_prefix = secrets.token_hex(8)
             
-            for index, row in enumerate(sheet.iter_rows(min_row=2, values_only=False), start=2):
+            for index, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
+                # Get cell values (read-only rows can be shorter than the header)
+                row = row + (None,) * (len(headers) - len(row))
+                player_name = str(row[player_name_idx]).strip() if player_name_idx >= 0 and row[player_name_idx] else ''
+                batch = str(row[batch_idx]).strip() if batch_idx >= 0 and row[batch_idx] else ''
+                position = str(row[position_idx]).strip() if position_idx >= 0 and row[position_idx] else ''
+                base_price = row[base_price_idx] if base_price_idx >= 0 and row[base_price_idx] else 0.0
+                photo_name = str(row[photo_name_idx]).strip() if photo_name_idx >= 0 and row[photo_name_idx] else None
+                
+                # Validate required fields
+                if not player_name or not batch or not position:
+                    error_count += 1
+                    add_error(f'Row {index}: Missing required fields')
+                    continue
+                
+                # Convert base_price to float
                 try:
-                    # Get cell values
-                    player_name = str(row[player_name_idx].value).strip() if player_name_idx >= 0 and row[player_name_idx].value else ''
-                    batch = str(row[batch_idx].value).strip() if batch_idx >= 0 and row[batch_idx].value else ''
-                    position = str(row[position_idx].value).strip() if position_idx >= 0 and row[position_idx].value else ''
-                    base_price = row[base_price_idx].value if base_price_idx >= 0 and row[base_price_idx].value else 0.0
-                    photo_name = str(row[photo_name_idx].value).strip() if photo_name_idx >= 0 and row[photo_name_idx].value else None
-                    
-                    # Validate required fields
-                    if not player_name or not batch or not position:
-                        error_count += 1
-                        errors.append(f'Row {index}: Missing required fields')
-                        continue
-                    
-                    # Convert base_price to float
-                    try:
-                        base_price = float(base_price) if base_price else 0.0
-                    except (ValueError, TypeError):
-                        base_price = 0.0
+                    base_price = float(base_price) if base_price else 0.0
+                except (ValueError, TypeError):
+                    base_price = 0.0
+                
+                # Handle photo upload
+                photo_filename = None
+                if photo_name and photo_name.strip():
+                    photo_source = find_photo(photo_index, photo_name.strip())
                     
-                    # Handle photo upload
-                    photo_filename = None
-                    if photo_name and photo_name.strip():
-                        photo_name_clean = photo_name.strip()
-                        # Look for photo in temp directory (case-insensitive matching)
-                        photo_path = None
-                        
-                        # First try exact match (case-insensitive)
-                        for root, dirs, files in os.walk(temp_photos_dir):
-                            for file in files:
-                                if file.lower() == photo_name_clean.lower():
-                                    photo_path = os.path.join(root, file)
-                                    break
-                            if photo_path:
-                                break
-                        
-                        # If not found, try partial match (filename without extension)
-                        if not photo_path:
-                            photo_name_base = os.path.splitext(photo_name_clean)[0].lower()
-                            for root, dirs, files in os.walk(temp_photos_dir):
-                                for file in files:
-                                    file_base = os.path.splitext(file)[0].lower()
-                                    if file_base == photo_name_base:
-                                        photo_path = os.path.join(root, file)
-                                        break
-                                if photo_path:
-                                    break
-                        
-                        # If still not found, try contains match
-                        if not photo_path:
-                            for root, dirs, files in os.walk(temp_photos_dir):
-                                for file in files:
-                                    if photo_name_base in file.lower() or file.lower() in photo_name_base:
-                                        photo_path = os.path.join(root, file)
-                                        break
-                                if photo_path:
-                                    break
-                        
-                        if photo_path and os.path.exists(photo_path):
-                            # Validate it's an image file
-                            if allowed_file(photo_path):
-                                # Save photo to permanent location
-                                file_ext = os.path.splitext(photo_path)[1]
-                                unique_filename = f"{uuid.uuid4().hex}{file_ext}"
-                                dest_path = os.path.join(app.config['PLAYER_PHOTO_FOLDER'], unique_filename)
-                                os.makedirs(app.config['PLAYER_PHOTO_FOLDER'], exist_ok=True)
-                                shutil.copy2(photo_path, dest_path)
-                                photo_filename = unique_filename
+                    if photo_source:
+                        from_zip = isinstance(photo_source, zipfile.ZipInfo)
+                        # Validate it's an image file
+                        file_ext = file_extension(photo_source.filename if from_zip else photo_source)
+                        if file_ext in ALLOWED_EXTENSIONS:
+                            # Copy photo to permanent location in the background
+                            photo_filename = f"{photo_name_prefix}{index:08x}.{file_ext}"
+                            dest_path = os.path.join(photo_folder, photo_filename)
+                            if from_zip:
+                                copy_future = photo_copy_executor.submit(extract_zip_member, photo_zip, photo_source, dest_path)
                             else:
-                                errors.append(f'Row {index}: Invalid photo format for {photo_name}')
+                                copy_future = photo_copy_executor.submit(link_or_copy, photo_source, dest_path)
                         else:
-                            # Photo not found, but continue without photo
-                            pass
-                    
-                    # Create player
-                    new_player = Player(
-                        name=player_name,
-                        batch=batch,
-                        position=position,
-                        base_price=base_price,
-                        photo_filename=photo_filename
-                    )
-                    db.session.add(new_player)
-                    success_count += 1
-                    
-                except Exception as e:
-                    error_count += 1
-                    errors.append(f'Row {index}: {str(e)}')
-                    continue
+                            add_error(f'Row {index}: Invalid photo format for {photo_name}')
+                    else:
+                        # Photo not found, but continue without photo
+                        pass
+                
+                # Queue player for a single multi-row insert
+                player_row = {
+                    'name': player_name,
+                    'batch': batch,
+                    'position': position,
+                    'base_price': base_price,
+                    'photo_filename': photo_filename,
+                    'thumb_filename': None
+                }
+                players_to_add.append(player_row)
+                if photo_filename:
+                    photo_copies.append((index, copy_future, player_row))
+                success_count += 1
             
-            # Commit all players
-            db.session.commit()
+            workbook.close()
             
-            # Clean up temp directory
-            shutil.rmtree(temp_photos_dir, ignore_errors=True)
+            # Wait for photo copies, then queue thumbnails for the copied photos
+            for index, copy_future, player_row in photo_copies:
+                try:
+                    copy_future.result()
+                    player_row['thumb_filename'] = schedule_thumbnail(photo_folder, player_row['photo_filename'])
+                except (OSError, zipfile.BadZipFile) as e:
+                    add_error(f'Row {index}: Could not copy photo: {str(e)}')
+                    player_row['photo_filename'] = None
+            
+            # Insert all players in one short Core transaction, opened only after the photo I/O is done
+            if players_to_add:
+                with db.engine.begin() as conn:
+                    conn.execute(insert(Player), players_to_add)
+            invalidate_home_cache()
             
-            # Show results
+            # Build result message
+            messages = []
             if success_count > 0:
-                flash(f'Successfully uploaded {success_count} player(s)!', 'success')
+                messages.append(f'Successfully uploaded {success_count} player(s)!')
             if error_count > 0:
                 error_msg = f'Failed to upload {error_count} player(s).'
                 if errors:
-                    error_msg += ' Errors: ' + '; '.join(errors[:5])  # Show first 5 errors
-                    if len(errors) > 5:
-                        error_msg += f' ... and {len(errors) - 5} more'
-                flash(error_msg, 'error')
+                    error_msg += ' Errors: ' + '; '.join(errors)  # Show first 5 errors
+                    if error_total > len(errors):
+                        error_msg += f' ... and {error_total - len(errors)} more'
+                messages.append(error_msg)
+            set_bulk_upload_status(job_id, status='done', success_count=success_count,
+                                   error_count=error_count, message=' '.join(messages))
             
-            return redirect(url_for('admin_dashboard'))
+        except Exception as e:
+            set_bulk_upload_status(job_id, status='failed', message=f'Error processing bulk upload: {str(e)}')
+        finally:
+            if photo_zip is not None:
+                photo_zip.close()
+            # Clean up temp directory
+            remove_temp_dir(temp_dir)
+
+@app.route('/admin/player/bulk-upload', methods=['GET', 'POST'])
+@admin_required
+def bulk_upload_players():
+    # File I/O stays synchronous with 1 MiB buffers (save_upload_stream, fast_copy, extract_zip_member).
+    # Under WSGI an async file library only adds thread-pool hops; revisit those helpers if the app moves to ASGI.
+    if request.method == 'POST':
+        # Imported here so workers that never handle a bulk upload don't pay for it
+        import zipfile
+        
+        excel_file = request.files.get('excel_file')
+        photos_folder = request.files.getlist('photos_folder')
+        photos_zip = request.files.get('photos_zip')
+        
+        if not excel_file or excel_file.filename == '':
+            flash('Please upload an Excel file', 'error')
+            return redirect(url_for('bulk_upload_players'))
+        
+        # Create temporary directory for the Excel file and photos
+        job_id = secrets.token_hex(16)
+        temp_dir = os.path.join('static', 'temp_photos', job_id)
+        temp_photos_dir = os.path.join(temp_dir, 'photos')
+        os.makedirs(temp_photos_dir, exist_ok=True)
+        
+        try:
+            # Save Excel file for the background task
+            excel_path = os.path.join(temp_dir, 'players.xlsx')
+            save_upload_stream(excel_file, excel_path)
             
+            # Handle zip file upload - kept as-is; the background task extracts only the photos it matches
+            if photos_zip and photos_zip.filename:
+                if photos_zip.filename.endswith('.zip'):
+                    zip_path = os.path.join(temp_dir, 'photos.zip')
+                    save_upload_stream(photos_zip, zip_path)
+                    if not zipfile.is_zipfile(zip_path):
+                        raise zipfile.BadZipFile('File is not a zip file')
+            
+            # Handle multiple file uploads
+            if photos_folder:
+                for photo_file in photos_folder:
+                    if photo_file and photo_file.filename:
+                        # Only the base name is needed to stay inside the job's temp dir; the final
+                        # photo name is generated, so keep the original name for matching against Excel
+                        filename = photo_file.filename.replace('\\', '/').rpartition('/')[2]
+                        if filename in ('', '.', '..') or '\x00' in filename:
+                            continue
+                        photo_path = os.path.join(temp_photos_dir, filename)
+                        save_upload_stream(photo_file, photo_path)
         except Exception as e:
-            shutil.rmtree(temp_photos_dir, ignore_errors=True)
+            remove_temp_dir(temp_dir)
             flash(f'Error processing bulk upload: {str(e)}', 'error')
             return redirect(url_for('bulk_upload_players'))
+        
+        set_bulk_upload_status(job_id, status='processing')
+        bulk_upload_executor.submit(process_bulk_upload, job_id, temp_dir, excel_path)
+        flash('Bulk upload started. Players are being processed in the background.', 'info')
+        return redirect(url_for('bulk_upload_players', job_id=job_id))
     
-    return render_template('bulk_upload_players.html', positions=FOOTBALL_POSITIONS)
+    return render_template('bulk_upload_players.html', positions=FOOTBALL_POSITIONS,
+                         job_id=request.args.get('job_id'))
+
+@app.route('/admin/player/bulk-upload/status/<job_id>')
+@admin_required
+def bulk_upload_status(job_id):
+    job = cache.get(f'bulk_upload:{job_id}')
+    if not job:
+        return jsonify({'error': 'Upload job not found'}), 404
+    return jsonify(job)
 
 # Auction Management Routes
+# Helper function to link players to an auction in one INSERT ... SELECT (unknown player ids are skipped)
+def add_auction_players(auction_id, player_ids):
+    if not player_ids:
+        return
+    db.session.execute(auction_players.insert().from_select(
+        ['auction_id', 'player_id'],
+        select(literal(auction_id), Player.id).where(Player.id.in_({int(pid) for pid in player_ids}))
+    ))
+
 @app.route('/admin/auction/add', methods=['GET', 'POST'])
 @admin_required
 def add_auction():
@@ -1004,12 +1574,11 @@ def add_auction():
             auction_setting_id=int(auction_setting_id) if auction_setting_id else None
         )
         
-        # Add selected players
-        if player_ids:
-            players = Player.query.filter(Player.id.in_([int(pid) for pid in player_ids])).all()
-            new_auction.players = players
-        
         db.session.add(new_auction)
+        db.session.flush()
+        
+        # Add selected players
+        add_auction_players(new_auction.id, player_ids)
         db.session.commit()
         
         flash('Auction created successfully!', 'success')
@@ -1054,13 +1623,9 @@ def edit_auction(auction_id):
         auction.sponsor = sponsor
         auction.auction_setting_id = int(auction_setting_id) if auction_setting_id else None
         
-        # Update players
-        if player_ids:
-            players = Player.query.filter(Player.id.in_([int(pid) for pid in player_ids])).all()
-            auction.players = players
-        else:
-            auction.players = []
-        
+        # Update players - replace the association rows without loading the current collection
+        db.session.execute(auction_players.delete().where(auction_players.c.auction_id == auction.id))
+        add_auction_players(auction.id, player_ids)
         db.session.commit()
         
         flash('Auction updated successfully!', 'success')
@@ -1078,6 +1643,7 @@ def delete_auction(auction_id):
     auction = Auction.query.get_or_404(auction_id)
     db.session.delete(auction)
     db.session.commit()
+    invalidate_home_cache()
     flash('Auction deleted successfully!', 'success')
     return redirect(url_for('admin_dashboard'))
 
@@ -1093,12 +1659,13 @@ def go_live_auction(auction_id):
     auction.highest_bid = 0
     auction.highest_bid_team_id = None
     db.session.commit()
+    invalidate_home_cache()
     
     # Broadcast auction started event to all connected users
-    socketio.emit('auction_started', {
+    broadcast('auction_started', {
         'auction_id': auction.id,
         'auction_name': auction.name
-    }, namespace='/')
+    })
     
     flash(f'Auction "{auction.name}" is now live!', 'success')
     return redirect(url_for('live_auction_control', auction_id=auction_id))
@@ -1110,12 +1677,13 @@ def close_auction(auction_id):
     auction.status = 'closed'
     auction.is_live = False
     db.session.commit()
+    invalidate_home_cache()
     
     # Broadcast auction closed event
-    socketio.emit('auction_closed', {
+    broadcast('auction_closed', {
         'auction_id': auction.id,
         'auction_name': auction.name
-    }, namespace='/')
+    })
     
     flash(f'Auction "{auction.name}" has been closed!', 'success')
     return redirect(url_for('admin_dashboard'))
@@ -1124,12 +1692,16 @@ def close_auction(auction_id):
 @app.route('/admin/auction/live/<int:auction_id>')
 @admin_required
 def live_auction_control(auction_id):
-    auction = Auction.query.get_or_404(auction_id)
+    # Load the auction's players and current player up front instead of lazily per access
+    auction = Auction.query.options(
+        selectinload(Auction.players),
+        joinedload(Auction.current_player)
+    ).get_or_404(auction_id)
     teams = Team.query.all()
     # Get available players (those in auction and not sold)
     # For now, all players in auction are available (we'll add sold_to field later if needed)
     available_players = auction.players if auction.players else []
-    current_player = Player.query.get(auction.current_player_id) if auction.current_player_id else None
+    current_player = auction.current_player
     
     return render_template('live_auction_control.html', 
                          auction=auction, 
@@ -1160,11 +1732,12 @@ def select_player():
             return jsonify({'error': 'Auction not found'}), 404
         
         if is_random:
-            # Select random available player
-            available_players = list(auction.players) if auction.players else []
-            if not available_players:
+            # Select random available player in the database instead of loading the whole list
+            player = Player.query.join(auction_players).filter(
+                auction_players.c.auction_id == auction.id
+            ).order_by(func.random()).limit(1).first()
+            if not player:
                 return jsonify({'error': 'No available players in this auction'}), 400
-            player = random.choice(available_players)
             player_id = player.id
         else:
             if not player_id:
@@ -1172,7 +1745,7 @@ def select_player():
             player = Player.query.get(player_id)
             if not player:
                 return jsonify({'error': 'Player not found'}), 404
-            if player not in auction.players:
+            if not row_exists(db.session.query(auction_players).filter_by(auction_id=auction.id, player_id=player.id)):
                 return jsonify({'error': 'Player not in this auction'}), 400
         
         # Set current player
@@ -1181,10 +1754,10 @@ def select_player():
         auction.highest_bid_team_id = None
         db.session.commit()
         
-        base_price = float(player.base_price) if player.base_price else 0.0
+        base_price = player.base_price_f
         
         # Broadcast player live event
-        socketio.emit('player_live', {
+        broadcast('player_live', {
             'player_id': player.id,
             'player_name': player.name,
             'base_price': base_price,
@@ -1194,7 +1767,7 @@ def select_player():
             'min_bid': float(auction.min_bid),
             'current_bid': 0.0,  # Start with 0
             'total_amount': base_price  # Total = base + bid (bid is 0 initially)
-        }, namespace='/')
+        })
         
         return jsonify({
             'success': True,
@@ -1257,19 +1830,19 @@ def place_bid():
         db.session.commit()
         
         # Calculate total (base_price + cumulative_bid_amount)
-        total_amount = float(player.base_price) + float(auction.highest_bid)
+        total_amount = player.base_price_f + float(auction.highest_bid)
         
         # Broadcast new bid event
-        socketio.emit('new_bid', {
+        broadcast('new_bid', {
             'team_id': team_id,
             'team_name': team.name,
             'amount': bid_amount,  # This bid amount
             'cumulative_bid': float(auction.highest_bid),  # Total cumulative bids
-            'base_price': float(player.base_price) if player.base_price else 0.0,
+            'base_price': player.base_price_f,
             'total_amount': total_amount,  # Base + Cumulative bids
             'player_id': player_id,
             'player_name': player.name
-        }, namespace='/')
+        })
         
         return jsonify({
             'success': True,
@@ -1297,7 +1870,7 @@ def sell_player():
     sold_team_id = auction.highest_bid_team_id
     sold_team = Team.query.get(sold_team_id)
     cumulative_bid_amount = auction.highest_bid or 0
-    base_price = float(player.base_price) if player.base_price else 0.0
+    base_price = player.base_price_f
     final_price = base_price + cumulative_bid_amount  # Final price = Base + All cumulative bids
     
     # Mark player as sold (we'll need to add these fields to Player model)
@@ -1308,7 +1881,7 @@ def sell_player():
     db.session.commit()
     
     # Broadcast player sold event with final price
-    socketio.emit('player_sold', {
+    broadcast('player_sold', {
         'player_id': player.id,
         'player_name': player.name,
         'team_id': sold_team_id,
@@ -1316,7 +1889,7 @@ def sell_player():
         'sold_price': final_price,  # Final price = Base + Cumulative bids
         'base_price': base_price,
         'cumulative_bids': cumulative_bid_amount
-    }, namespace='/')
+    })
     
     return jsonify({'success': True})
 
@@ -1400,153 +1973,162 @@ def live_auction_view():
                          current_player=current_player,
                          highest_bid_team=highest_bid_team)
 
-if __name__ == '__main__':
-    with app.app_context():
-        # Create all tables first
-        db.create_all()
-        
-        # Migrate existing database: Add new columns if they don't exist
-        try:
-            from sqlalchemy import inspect, text
-            inspector = inspect(db.engine)
-            
-            # Check if team table exists
-            if 'team' in inspector.get_table_names():
-                columns = [col['name'] for col in inspector.get_columns('team')]
-                
-                # Add coowner_name column if it doesn't exist
-                if 'coowner_name' not in columns:
-                    db.session.execute(text('ALTER TABLE team ADD COLUMN coowner_name VARCHAR(100)'))
-                    db.session.commit()
-                    print("✓ Added coowner_name column to team table")
-                
-                # Add price column if it doesn't exist
-                if 'price' not in columns:
-                    db.session.execute(text('ALTER TABLE team ADD COLUMN price FLOAT DEFAULT 0.0'))
-                    db.session.commit()
-                    print("✓ Added price column to team table")
-                
-                # Add number_of_members column if it doesn't exist
-                if 'number_of_members' not in columns:
-                    db.session.execute(text('ALTER TABLE team ADD COLUMN number_of_members INTEGER DEFAULT 12'))
-                    db.session.commit()
-                    print("✓ Added number_of_members column to team table")
-                
-                # Add logo_filename column if it doesn't exist
-                if 'logo_filename' not in columns:
-                    db.session.execute(text('ALTER TABLE team ADD COLUMN logo_filename VARCHAR(255)'))
-                    db.session.commit()
-                    print("✓ Added logo_filename column to team table")
-        except Exception as e:
-            print(f"Migration check: {e}")
-        
-        # Migrate SlotManagement table
-        try:
-            if 'slot_management' in inspector.get_table_names():
-                slot_columns = [col['name'] for col in inspector.get_columns('slot_management')]
-                if 'total_teams' not in slot_columns:
-                    db.session.execute(text('ALTER TABLE slot_management ADD COLUMN total_teams INTEGER DEFAULT 12'))
-                    db.session.commit()
-                    print("✓ Added total_teams column to slot_management table")
-        except Exception as e:
-            print(f"SlotManagement migration: {e}")
-        
-        # Migrate AuctionSetting table
-        try:
-            if 'auction_setting' in inspector.get_table_names():
-                auction_columns = [col['name'] for col in inspector.get_columns('auction_setting')]
-                if 'auction_date' not in auction_columns:
-                    db.session.execute(text('ALTER TABLE auction_setting ADD COLUMN auction_date VARCHAR(100)'))
-                    db.session.commit()
-                    print("✓ Added auction_date column to auction_setting table")
-                if 'auction_place' not in auction_columns:
-                    db.session.execute(text('ALTER TABLE auction_setting ADD COLUMN auction_place VARCHAR(200)'))
-                    db.session.commit()
-                    print("✓ Added auction_place column to auction_setting table")
-        except Exception as e:
-            print(f"AuctionSetting migration: {e}")
-        
-        # Create Auction table if it doesn't exist
-        try:
-            if 'auction' not in inspector.get_table_names():
-                print("✓ Creating auction table...")
-            else:
-                auction_columns = [col['name'] for col in inspector.get_columns('auction')]
-                if 'auction_setting_id' not in auction_columns:
-                    db.session.execute(text('ALTER TABLE auction ADD COLUMN auction_setting_id INTEGER'))
-                    db.session.commit()
-                    print("✓ Added auction_setting_id column to auction table")
-                if 'is_live' not in auction_columns:
-                    # SQLite uses INTEGER for boolean (0 or 1)
-                    db.session.execute(text('ALTER TABLE auction ADD COLUMN is_live INTEGER DEFAULT 0'))
-                    db.session.commit()
-                    print("✓ Added is_live column to auction table")
-                if 'current_player_id' not in auction_columns:
-                    db.session.execute(text('ALTER TABLE auction ADD COLUMN current_player_id INTEGER'))
-                    db.session.commit()
-                    print("✓ Added current_player_id column to auction table")
-                if 'highest_bid' not in auction_columns:
-                    db.session.execute(text('ALTER TABLE auction ADD COLUMN highest_bid FLOAT DEFAULT 0.0'))
-                    db.session.commit()
-                    print("✓ Added highest_bid column to auction table")
-                if 'highest_bid_team_id' not in auction_columns:
-                    db.session.execute(text('ALTER TABLE auction ADD COLUMN highest_bid_team_id INTEGER'))
-                    db.session.commit()
-                    print("✓ Added highest_bid_team_id column to auction table")
-        except Exception as e:
-            print(f"Auction migration: {e}")
-        
-        # Create Bid table if it doesn't exist
+# Helper function to bring an existing database up to the current schema (columns and indexes)
+# Returns True only if every step succeeded, so a failed step is retried on the next start
+def migrate_schema():
+    succeeded = True
+    
+    # Migrate existing database: Add new columns if they don't exist
+    try:
+        from sqlalchemy import inspect, text
+        inspector = inspect(db.engine)
+        
+        table_names = set(inspector.get_table_names())
+        
+        # Reflect the columns of every migrated table in one call (one catalog query on PostgreSQL)
+        existing_tables = [table_name for table_name in ADDED_COLUMNS if table_name in table_names]
+        reflected_columns = {
+            table_name: {col['name'] for col in table_cols}
+            for (_, table_name), table_cols in inspector.get_multi_columns(filter_names=existing_tables).items()
+        }
+        missing_columns = {}
+        for table_name in existing_tables:
+            table_columns = ADDED_COLUMNS[table_name]
+            columns = reflected_columns.get(table_name, set())
+            missing = [(name, ddl) for name, ddl in table_columns if name not in columns]
+            if missing:
+                missing_columns[table_name] = missing
+        
+        # Add all missing columns in a single transaction
+        # (SQLite has no ADD COLUMN IF NOT EXISTS, so keep the membership test)
+        if missing_columns:
+            with db.engine.begin() as conn:
+                for table_name, missing in missing_columns.items():
+                    add_clauses = [f'ADD COLUMN {name} {ddl}' for name, ddl in missing]
+                    if db.engine.dialect.name == 'sqlite':
+                        # SQLite only accepts one ADD COLUMN per ALTER TABLE
+                        for add_clause in add_clauses:
+                            conn.execute(text(f'ALTER TABLE {table_name} {add_clause}'))
+                    else:
+                        conn.execute(text(f'ALTER TABLE {table_name} {", ".join(add_clauses)}'))
+            for table_name, missing in missing_columns.items():
+                for name, ddl in missing:
+                    print(f"✓ Added {name} column to {table_name} table")
+    except Exception as e:
+        succeeded = False
+        print(f"Migration check: {e}")
+    
+    # Widen password columns to fit password hashes (SQLite does not enforce VARCHAR length)
+    try:
+        if db.engine.dialect.name != 'sqlite':
+            widened_tables = []
+            for table_name in ('admin', 'team_user'):
+                password_column = next(col for col in inspector.get_columns(table_name) if col['name'] == 'password')
+                if (password_column['type'].length or 0) < 255:
+                    db.session.execute(text(f'ALTER TABLE {table_name} ALTER COLUMN password TYPE VARCHAR(255)'))
+                    widened_tables.append(table_name)
+            if widened_tables:
+                db.session.commit()
+            for table_name in widened_tables:
+                print(f"✓ Widened password column in {table_name} table")
+    except Exception as e:
+        db.session.rollback()
+        succeeded = False
+        print(f"Password column migration: {e}")
+    
+    # Add indexes on lookup columns, each in its own transaction so one failure doesn't discard the others
+    index_statements = [
+        'CREATE UNIQUE INDEX IF NOT EXISTS ix_team_name ON team (name)',
+        'CREATE INDEX IF NOT EXISTS ix_team_user_team_id ON team_user (team_id)',
+        'CREATE INDEX IF NOT EXISTS ix_player_batch ON player (batch)',
+        'CREATE INDEX IF NOT EXISTS ix_player_position ON player (position)',
+        'CREATE INDEX IF NOT EXISTS ix_auction_live ON auction (is_live, status)',
+        'CREATE INDEX IF NOT EXISTS ix_auction_created_at ON auction (created_at)',
+        'CREATE INDEX IF NOT EXISTS ix_bid_auction_player_team ON bid (auction_id, player_id, team_id)',
+        'DROP INDEX IF EXISTS ix_bid_auction_id',
+        'CREATE INDEX IF NOT EXISTS ix_bid_player_id ON bid (player_id)',
+        'CREATE INDEX IF NOT EXISTS ix_bid_team_id ON bid (team_id)',
+    ]
+    for statement in index_statements:
         try:
-            if 'bid' not in inspector.get_table_names():
-                print("✓ Creating bid table...")
+            with db.engine.begin() as conn:
+                conn.execute(text(statement))
         except Exception as e:
-            print(f"Bid migration: {e}")
-        
-        # Create player_photos directory
-        os.makedirs(app.config['PLAYER_PHOTO_FOLDER'], exist_ok=True)
-        
-        # Create temp_photos directory for bulk uploads
-        os.makedirs('static/temp_photos', exist_ok=True)
-        
-        # Initialize default admin if not exists
-        if not Admin.query.first():
-            admin = Admin(username='admin', password='admin123')
-            db.session.add(admin)
-        
-        # Initialize slot management
-        if not SlotManagement.query.first():
-            slot_mgmt = SlotManagement(total_slots=12, total_teams=12, filled_slots=0, remaining_slots=12)
-            db.session.add(slot_mgmt)
-        
-        # Initialize default auction time - Saturday Dec 14, 2025 at 10:00 AM
-        if not AuctionSetting.query.first():
-            default_time = datetime(2025, 12, 14, 10, 0, 0)
-            auction_setting = AuctionSetting(
-                auction_start_time=default_time,
-                auction_date="Saturday, December 14, 2025",
-                auction_place="Main Auditorium"
-            )
-            db.session.add(auction_setting)
-        
-        # Add sample teams if database is empty
-        if not Team.query.first():
-            sample_teams = [
-                Team(name='Team Alpha', owner='John Doe', coowner_name='Jane Doe', batch='CSE 1', price=50000.00, number_of_members=12),
-                Team(name='Team Beta', owner='Jane Smith', batch='CSE 2', price=45000.00, number_of_members=12),
-                Team(name='Team Gamma', owner='Mike Johnson', coowner_name='Lisa Johnson', batch='CSE 1', price=55000.00, number_of_members=12),
-                Team(name='Team Delta', owner='Sarah Williams', batch='CSE 3', price=48000.00, number_of_members=12),
-            ]
-            for team in sample_teams:
-                db.session.add(team)
-            
-            # Add sample team users
-            team1 = Team.query.filter_by(name='Team Alpha').first()
-            if team1:
-                team_user = TeamUser(team_id=team1.id, username='team1', password='team123')
-                db.session.add(team_user)
-        
+            succeeded = False
+            print(f"Index migration: {e}")
+    
+    return succeeded
+
+
+# Sample teams seeded into an empty database
+SAMPLE_TEAMS = [
+    dict(name='Team Alpha', owner='John Doe', coowner_name='Jane Doe', batch='CSE 1', price=50000.00, number_of_members=12),
+    dict(name='Team Beta', owner='Jane Smith', coowner_name=None, batch='CSE 2', price=45000.00, number_of_members=12),
+    dict(name='Team Gamma', owner='Mike Johnson', coowner_name='Lisa Johnson', batch='CSE 1', price=55000.00, number_of_members=12),
+    dict(name='Team Delta', owner='Sarah Williams', coowner_name=None, batch='CSE 3', price=48000.00, number_of_members=12),
+]
+
+# Create tables, apply migrations and seed default data (run by `python app.py` or `flask init-db`)
+def init_db():
+    # Create all tables first
+    db.create_all()
+    
+    # Restore the default admin whenever no admin exists, so init-db can always bring back a login
+    # (checked on every run; the password is only hashed when the row is actually inserted)
+    if not row_exists(Admin.query):
+        insert_default_row(Admin, username='admin', password=generate_password_hash('admin123', method=PASSWORD_HASH_METHOD))
+    
+    # Migrate and seed once per schema version instead of inspecting the database on every boot
+    schema_version = db.session.get(SchemaVersion, 1)
+    if schema_version is not None and schema_version.version >= SCHEMA_VERSION:
         db.session.commit()
+        return
+    
+    # Only record the version when every migration step succeeded, otherwise retry on the next start
+    if migrate_schema():
+        if schema_version is None:
+            db.session.add(SchemaVersion(id=1, version=SCHEMA_VERSION))
+        else:
+            schema_version.version = SCHEMA_VERSION
+    else:
+        print("Schema migration incomplete, it will be retried on the next start")
+    
+    # Initialize default slot management and auction time (no-ops if the rows exist)
+    insert_default_settings()
+    
+    # Add sample teams if database is empty
+    if not row_exists(Team.query):
+        db.session.execute(insert(Team), SAMPLE_TEAMS)
+        
+        # Add sample team user for Team Alpha in the same statement that looks up its id
+        team1_password = generate_password_hash('team123', method=PASSWORD_HASH_METHOD)
+        db.session.execute(
+            insert(TeamUser).from_select(
+                ['team_id', 'username', 'password'],
+                select(Team.id, literal('team1'), literal(team1_password)).where(Team.name == 'Team Alpha')
+            )
+        )
+    
+    # Backfill default user accounts for teams created before add_team made them
+    provision_team_users()
+    
+    # Hash legacy plaintext passwords (logins upgrade them too, but only for users who log in)
+    for model in (Admin, TeamUser):
+        for user in model.query.filter(~model.password.startswith('pbkdf2:'), ~model.password.startswith('scrypt:')):
+            user.password = generate_password_hash(user.password, method=PASSWORD_HASH_METHOD)
+    
+    # Commit the schema version and seed data together
+    db.session.commit()
+
+
+@app.cli.command('init-db')
+def init_db_command():
+    init_db()
+    print("✓ Database initialized")
+
+if __name__ == '__main__':
+    with app.app_context():
+        init_db()
     
     # Only run with Flask dev server if not in production
     if os.environ.get('FLASK_ENV') != 'production':
@@ -0,0 +1,14 @@
+import os
+
+# Gunicorn configuration - gevent workers for the polling/upload/Socket.IO traffic
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# Socket.IO keeps connection state per process, so default to a single worker
+# unless WEB_CONCURRENCY is set explicitly
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+worker_class = 'gevent'  # The gevent worker monkey-patches the stdlib before loading the app
+worker_connections = 1000
+keepalive = 5
+
+# Tell the app to run Socket.IO in gevent mode inside the workers
+raw_env = ['SOCKETIO_ASYNC_MODE=gevent']